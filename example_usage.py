@@ -124,37 +124,38 @@ def example_language_detection():
             print(f"File {audio_file} not found, skipping...")
 
 def create_sample_audio():
-    """Create a sample audio file for testing (requires librosa)."""
+    """Create a sample audio file for testing (requires numpy and soundfile)."""
     print("\n" + "=" * 60)
     print("CREATING SAMPLE AUDIO FILE")
     print("=" * 60)
-    
+
     try:
-        import librosa
         import numpy as np
-        
+        import soundfile as sf
+
         # Generate a simple sine wave as sample audio
         duration = 5  # seconds
         sample_rate = 16000
         frequency = 440  # A4 note
-        
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        audio = np.sin(2 * np.pi * frequency * t) * 0.3
-        
+
+        n_samples = sample_rate * duration
+        t = np.arange(n_samples, dtype=np.float32) / sample_rate
+        audio = 0.3 * np.sin(2 * np.pi * frequency * t)
+
         # Add some variation to make it more interesting
-        audio += np.sin(2 * np.pi * frequency * 2 * t) * 0.1
-        audio += np.random.normal(0, 0.05, len(audio))
-        
+        audio += 0.1 * np.sin(2 * np.pi * frequency * 2 * t)
+        audio += np.random.default_rng(0).standard_normal(n_samples).astype(np.float32) * 0.05
+
         # Save as WAV file
         output_file = "sample_audio.wav"
-        librosa.output.write_wav(output_file, audio, sample_rate)
-        
+        sf.write(output_file, audio, sample_rate, subtype='PCM_16')
+
         print(f"Sample audio file created: {output_file}")
         print("You can now use this file for testing the transcription.")
-        
+
     except ImportError:
-        print("librosa not available. Cannot create sample audio file.")
-        print("Please install librosa or provide your own audio file.")
+        print("numpy or soundfile not available. Cannot create sample audio file.")
+        print("Please install the requirements or provide your own audio file.")
     except Exception as e:
         print(f"Error creating sample audio: {e}")
 
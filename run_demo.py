@@ -22,14 +22,15 @@ def show_menu():
     print("=" * 50)
 
 def run_web_interface():
-    """Start the web interface."""
+    """Start the web interface (replaces the launcher process)."""
     print("Starting web interface...")
-    print("Open your browser and go to: http://localhost:5000")
+    print("Open your browser and go to: http://localhost:5001")
     print("Press Ctrl+C to stop the server")
-    try:
-        subprocess.run([sys.executable, "web_app.py"])
-    except KeyboardInterrupt:
-        print("\nWeb interface stopped.")
+    # The menu has nothing left to do once the server is running, so
+    # replace this process instead of keeping an idle parent interpreter
+    # around just to wait on the child. This action does not return to
+    # the menu.
+    os.execv(sys.executable, [sys.executable, "web_app.py"])
 
 def run_command_line():
     """Run command line demo."""
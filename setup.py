@@ -6,12 +6,59 @@ Setup script for OpenAI Whisper Demo
 import subprocess
 import sys
 import os
+import hashlib
+from pathlib import Path
+
+WHEELHOUSE = Path("wheels")
+
+def build_wheels():
+    """Pre-build all requirements into a local wheelhouse.
+
+    Later installs can then run from local .whl files with --no-index
+    instead of re-downloading or compiling sdists.
+    """
+    print("Building wheelhouse (this can take a while the first time)...")
+    try:
+        # Newer pip caches more aggressively, so upgrade it first
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip"])
+        subprocess.check_call([sys.executable, "-m", "pip", "wheel",
+                               "-r", "requirements.txt", "-w", str(WHEELHOUSE)])
+        print(f"✅ Wheelhouse ready in {WHEELHOUSE}/")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error building wheels: {e}")
+        return False
 
 def install_requirements():
     """Install required packages."""
+    # Skip the whole pip resolution when requirements.txt hasn't changed
+    # since the last successful install into this environment
+    req_hash = hashlib.sha256(Path("requirements.txt").read_bytes()).hexdigest()
+    marker = Path(sys.prefix) / ".whisper_demo_req_hash"
+    try:
+        if marker.read_text().strip() == req_hash:
+            print("✅ Requirements already satisfied (requirements.txt unchanged)")
+            return True
+    except OSError:
+        pass
+
     print("Installing required packages...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Ensure wheel is present first so cached wheels are used
+        # instead of rebuilding sdists
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "wheel"])
+        if WHEELHOUSE.is_dir() and any(WHEELHOUSE.glob("*.whl")):
+            # Install straight from the local wheelhouse, no network
+            subprocess.check_call([sys.executable, "-m", "pip", "install",
+                                   "--no-index", f"--find-links={WHEELHOUSE}",
+                                   "-r", "requirements.txt"])
+        else:
+            subprocess.check_call([sys.executable, "-m", "pip", "install",
+                                   "--prefer-binary", "-r", "requirements.txt"])
+        try:
+            marker.write_text(req_hash + "\n")
+        except OSError:
+            pass
         print("✅ Requirements installed successfully!")
         return True
     except subprocess.CalledProcessError as e:
@@ -20,7 +67,7 @@ def install_requirements():
 
 def create_directories():
     """Create necessary directories."""
-    directories = ["uploads", "audio_files", "transcriptions"]
+    directories = ["audio_files", "transcriptions"]
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
@@ -32,7 +79,7 @@ def test_installation():
     try:
         import whisper
         import torch
-        import librosa
+        import soundfile
         import flask
         print("✅ All required packages are available!")
         return True
@@ -44,7 +91,13 @@ def main():
     """Main setup function."""
     print("🚀 Setting up OpenAI Whisper Demo...")
     print("=" * 50)
-    
+
+    # Optionally warm a local wheelhouse for fast repeat installs
+    if "--build-wheels" in sys.argv:
+        if not build_wheels():
+            print("Setup failed. Please check the error messages above.")
+            return False
+
     # Install requirements
     if not install_requirements():
         print("Setup failed. Please check the error messages above.")
@@ -7,37 +7,56 @@ Installs Node.js dependencies and checks requirements
 import subprocess
 import sys
 import os
+import shutil
+import hashlib
 from pathlib import Path
 
 def check_nodejs():
     """Check if Node.js is installed."""
-    try:
-        result = subprocess.run(['node', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print(f"✅ Node.js found: {version}")
-            return True
-        else:
-            print("❌ Node.js not found")
-            return False
-    except FileNotFoundError:
-        print("❌ Node.js not found")
-        return False
+    # A PATH lookup is enough here; no need to fork/exec node
+    path = shutil.which('node')
+    if path:
+        print(f"✅ Node.js found: {path}")
+        return True
+    print("❌ Node.js not found")
+    return False
 
 def check_npm():
     """Check if npm is available."""
+    path = shutil.which('npm')
+    if path:
+        print(f"✅ npm found: {path}")
+        return True
+    print("❌ npm not found")
+    return False
+
+def lockfile_hash(asterisk_dir):
+    """Hash of package-lock.json, or None if there is no lockfile."""
+    lockfile = Path(asterisk_dir) / 'package-lock.json'
+    if not lockfile.exists():
+        return None
+    return hashlib.sha256(lockfile.read_bytes()).hexdigest()
+
+def npm_install_needed(asterisk_dir):
+    """True unless node_modules was installed from the current lockfile."""
+    current = lockfile_hash(asterisk_dir)
+    if current is None:
+        return True
+    marker = Path(asterisk_dir) / 'node_modules' / '.install-hash'
     try:
-        result = subprocess.run(['npm', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print(f"✅ npm found: {version}")
-            return True
-        else:
-            print("❌ npm not found")
-            return False
-    except FileNotFoundError:
-        print("❌ npm not found")
-        return False
+        return marker.read_text().strip() != current
+    except OSError:
+        return True
+
+def record_npm_install(asterisk_dir):
+    """Remember which lockfile the current node_modules came from."""
+    current = lockfile_hash(asterisk_dir)
+    if current is not None:
+        marker = Path(asterisk_dir) / 'node_modules' / '.install-hash'
+        try:
+            marker.write_text(current + '\n')
+        except OSError:
+            pass
 
 def install_dependencies():
     """Install Node.js dependencies."""
@@ -47,9 +66,14 @@ def install_dependencies():
         print("❌ Asterisk server directory not found")
         return False
     
+    if not npm_install_needed(asterisk_dir):
+        print("✅ Dependencies already up to date (package-lock.json unchanged)")
+        return True
+
     print("📦 Installing Node.js dependencies...")
     try:
         result = subprocess.run(['npm', 'install'], cwd=asterisk_dir, check=True)
+        record_npm_install(asterisk_dir)
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -4,54 +4,58 @@ Startup script for IPMD Voice-to-Text Testing Platform
 Starts both Whisper (Python) and Asterisk AEAP (Node.js) servers
 """
 
-import subprocess
+import asyncio
+import shutil
 import sys
 import os
-import time
 import signal
-import threading
 from pathlib import Path
 
+from setup_asterisk import npm_install_needed, record_npm_install
+
 class PlatformManager:
     def __init__(self):
         self.processes = []
         self.running = True
-        
-    def start_whisper_server(self):
+
+    async def start_whisper_server(self):
         """Start the Whisper web server."""
         print("🐍 Starting Whisper server...")
         try:
-            process = subprocess.Popen([
-                sys.executable, 'web_app.py'
-            ], cwd=os.getcwd())
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, 'web_app.py', cwd=os.getcwd())
             self.processes.append(('Whisper', process))
             print("✅ Whisper server started on http://localhost:5001")
             return True
         except Exception as e:
             print(f"❌ Failed to start Whisper server: {e}")
             return False
-    
-    def start_asterisk_server(self):
+
+    async def start_asterisk_server(self):
         """Start the Asterisk AEAP server."""
         print("⚡ Starting Asterisk AEAP server...")
         try:
-            # Check if Node.js is available
-            try:
-                subprocess.run(['node', '--version'], check=True, capture_output=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
+            # Check if Node.js is available (PATH lookup, no child process)
+            if not shutil.which('node'):
                 print("❌ Node.js not found. Please install Node.js to run Asterisk AEAP server.")
                 return False
-            
-            # Install Node.js dependencies
+
+            # Install Node.js dependencies (skipped when node_modules
+            # already matches the current package-lock.json)
             asterisk_dir = Path('asterisk-server')
             if asterisk_dir.exists():
-                print("📦 Installing Asterisk server dependencies...")
-                subprocess.run(['npm', 'install'], cwd=asterisk_dir, check=True)
-                
+                if npm_install_needed(asterisk_dir):
+                    print("📦 Installing Asterisk server dependencies...")
+                    npm = await asyncio.create_subprocess_exec(
+                        'npm', 'install', cwd=asterisk_dir)
+                    if await npm.wait() != 0:
+                        print("❌ Failed to install Asterisk server dependencies")
+                        return False
+                    record_npm_install(asterisk_dir)
+
                 # Start the server
-                process = subprocess.Popen([
-                    'node', 'index.js'
-                ], cwd=asterisk_dir)
+                process = await asyncio.create_subprocess_exec(
+                    'node', 'index.js', cwd=asterisk_dir)
                 self.processes.append(('Asterisk', process))
                 print("✅ Asterisk AEAP server started on http://localhost:3001")
                 return True
@@ -61,7 +65,7 @@ class PlatformManager:
         except Exception as e:
             print(f"❌ Failed to start Asterisk server: {e}")
             return False
-    
+
     def check_google_credentials(self):
         """Check if Google Speech API credentials are available."""
         google_creds = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
@@ -76,23 +80,25 @@ class PlatformManager:
         else:
             print("✅ Google Speech API credentials found")
             return True
-    
-    def start_platform(self):
+
+    async def start_platform(self):
         """Start the entire platform."""
         print("🚀 Starting IPMD Voice-to-Text Testing Platform")
         print("=" * 60)
-        
+
         # Check Google credentials
         self.check_google_credentials()
-        
-        # Start servers
-        whisper_ok = self.start_whisper_server()
-        asterisk_ok = self.start_asterisk_server()
-        
+
+        # Start both servers concurrently; npm install and the Whisper
+        # process warmup overlap instead of running back to back
+        whisper_ok, asterisk_ok = await asyncio.gather(
+            self.start_whisper_server(),
+            self.start_asterisk_server())
+
         if not whisper_ok and not asterisk_ok:
             print("❌ Failed to start any servers")
             return False
-        
+
         print("\n" + "=" * 60)
         print("🎉 Platform started successfully!")
         print("=" * 60)
@@ -104,47 +110,59 @@ class PlatformManager:
             print("⚡ Asterisk AEAP Engine: Not available (check Google credentials)")
         print("\nPress Ctrl+C to stop all servers")
         print("=" * 60)
-        
+
         return True
-    
-    def stop_platform(self):
+
+    async def stop_platform(self):
         """Stop all running processes."""
         print("\n🛑 Stopping platform...")
         self.running = False
-        
+
         for name, process in self.processes:
             try:
                 print(f"Stopping {name} server...")
                 process.terminate()
-                process.wait(timeout=5)
+                await asyncio.wait_for(process.wait(), timeout=5)
                 print(f"✅ {name} server stopped")
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 print(f"Force killing {name} server...")
                 process.kill()
+            except ProcessLookupError:
+                pass
             except Exception as e:
                 print(f"Error stopping {name} server: {e}")
-        
+
         print("✅ Platform stopped")
-    
+
+    async def _main(self):
+        """Start the platform and sleep until a child exits or we're signaled."""
+        if not await self.start_platform():
+            return
+
+        stop_requested = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_requested.set)
+            except NotImplementedError:
+                # add_signal_handler is unavailable on some platforms
+                signal.signal(sig, lambda signum, frame: stop_requested.set())
+
+        # Block in the kernel instead of polling a flag every second
+        waiters = [asyncio.ensure_future(p.wait()) for _, p in self.processes]
+        waiters.append(asyncio.ensure_future(stop_requested.wait()))
+        await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for w in waiters:
+            w.cancel()
+
+        await self.stop_platform()
+
     def run(self):
         """Run the platform with signal handling."""
-        if not self.start_platform():
-            return
-        
-        # Set up signal handlers
-        def signal_handler(signum, frame):
-            self.stop_platform()
-            sys.exit(0)
-        
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        
         try:
-            # Keep the main thread alive
-            while self.running:
-                time.sleep(1)
+            asyncio.run(self._main())
         except KeyboardInterrupt:
-            self.stop_platform()
+            pass
 
 def main():
     """Main function."""
@@ -4,39 +4,20 @@ Test script for OpenAI Whisper Demo
 This script tests the basic functionality without requiring actual audio files.
 """
 
-import os
 import sys
-import tempfile
-import numpy as np
-from whisper_demo import WhisperDemo
 
 def create_test_audio():
-    """Create a simple test audio file."""
+    """Create (or reuse) a simple test audio file."""
     try:
-        import librosa
-        import soundfile as sf
-        
-        # Generate a simple sine wave
-        duration = 2  # seconds
-        sample_rate = 16000
-        frequency = 440  # A4 note
-        
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        audio = np.sin(2 * np.pi * frequency * t) * 0.3
-        
-        # Add some variation
-        audio += np.sin(2 * np.pi * frequency * 2 * t) * 0.1
-        audio += np.random.normal(0, 0.05, len(audio))
-        
-        # Save as temporary file
-        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        sf.write(temp_file.name, audio, sample_rate)
-        temp_file.close()
-        
-        return temp_file.name
-        
+        import soundfile  # availability check; fixtures write with soundfile
+        from test_fixtures import get_or_make_fixture
+
+        # Cached fixture: synthesized once, reused on later runs
+        return get_or_make_fixture(duration=2, sample_rate=16000,
+                                   frequency=440, ext='wav')
+
     except ImportError:
-        print("librosa or soundfile not available, cannot create test audio")
+        print("soundfile not available, cannot create test audio")
         return None
     except Exception as e:
         print(f"Error creating test audio: {e}")
@@ -46,6 +27,8 @@ def test_model_loading():
     """Test if Whisper model can be loaded."""
     print("Testing model loading...")
     try:
+        from whisper_demo import WhisperDemo
+
         demo = WhisperDemo(model_size="tiny")  # Use tiny model for faster testing
         demo.load_model()
         print("✅ Model loaded successfully!")
@@ -65,6 +48,8 @@ def test_audio_processing():
         return False
     
     try:
+        from whisper_demo import WhisperDemo
+
         demo = WhisperDemo(model_size="tiny")
         demo.load_model()
         
@@ -75,15 +60,12 @@ def test_audio_processing():
         print(f"   Detected language: {result['language']}")
         print(f"   Audio duration: {result['audio_duration']:.2f}s")
         print(f"   Processing time: {result['transcription_time']:.2f}s")
-        
-        # Clean up
-        os.unlink(test_audio)
+
+        # The fixture is shared across runs; no cleanup needed
         return True
-        
+
     except Exception as e:
         print(f"❌ Audio processing failed: {e}")
-        if test_audio and os.path.exists(test_audio):
-            os.unlink(test_audio)
         return False
 
 def test_web_imports():
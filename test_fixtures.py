@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cached audio fixtures shared by the test scripts.
+
+Synthesized test audio is written once under .fixtures/ and reused by
+later runs, so repeated test invocations skip the numpy synthesis and
+(for webm) the FFmpeg transcode.
+"""
+
+import subprocess
+from pathlib import Path
+
+FIXTURE_DIR = Path('.fixtures')
+
+# Shared seeded generator (PCG64); created on first use since numpy is
+# imported lazily
+_rng = None
+
+
+def _get_rng():
+    global _rng
+    if _rng is None:
+        import numpy as np
+        _rng = np.random.default_rng(0)
+    return _rng
+
+
+def _synthesize(duration, sample_rate, frequency):
+    """Build the standard sine-plus-noise test waveform."""
+    import numpy as np
+
+    t = np.linspace(0, duration, int(sample_rate * duration), False,
+                    dtype=np.float32)
+
+    # Both harmonics in one fused sin + matmul instead of three
+    # full-length temporaries; float32 end-to-end to halve bandwidth
+    amps = np.array([0.3, 0.1], dtype=np.float32)
+    freqs = np.array([frequency, 2 * frequency], dtype=np.float32)
+    audio = np.sin(2 * np.pi * np.outer(t, freqs)) @ amps
+
+    # Add some variation; standard_normal fills float32 directly, no
+    # float64 intermediate
+    audio += _get_rng().standard_normal(len(audio), dtype=np.float32) * np.float32(0.05)
+
+    return audio
+
+
+def get_or_make_fixture(duration, sample_rate, frequency, ext):
+    """
+    Return the path to a cached test audio file, creating it on first use.
+
+    Args:
+        duration: Length in seconds
+        sample_rate: Sample rate in Hz
+        frequency: Base tone frequency in Hz
+        ext: 'wav' or 'webm'
+
+    Returns:
+        Path string to a shared fixture file (callers must not delete it)
+    """
+    FIXTURE_DIR.mkdir(exist_ok=True)
+    path = FIXTURE_DIR / f'sine_{sample_rate}_{duration}_{frequency}.{ext}'
+    if path.exists():
+        return str(path)
+
+    audio = _synthesize(duration, sample_rate, frequency)
+
+    if ext == 'wav':
+        import soundfile as sf
+
+        sf.write(path, audio, sample_rate)
+        return str(path)
+
+    if ext == 'webm':
+        # Pipe raw PCM straight into FFmpeg and read WEBM back from
+        # stdout: no intermediate WAV round-trip through the filesystem
+        import numpy as np
+
+        proc = subprocess.Popen([
+            'ffmpeg', '-f', 's16le', '-ar', str(sample_rate), '-ac', '1',
+            '-i', 'pipe:0', '-c:a', 'libopus', '-b:a', '64k',
+            '-f', 'webm', 'pipe:1', '-y'
+        ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        pcm = (audio * 32767).astype(np.int16).tobytes()
+        webm_bytes, stderr = proc.communicate(pcm)
+        if proc.returncode != 0:
+            raise RuntimeError(f"FFmpeg error: {stderr.decode(errors='replace')}")
+        path.write_bytes(webm_bytes)
+        return str(path)
+
+    raise ValueError(f"Unsupported fixture extension: {ext}")
@@ -3,51 +3,17 @@
 Test script to verify recording functionality works
 """
 
-import os
-import tempfile
-import numpy as np
-import soundfile as sf
 from whisper_demo import WhisperDemo
 
 def create_test_webm():
-    """Create a test webm file to simulate recorded audio."""
+    """Create (or reuse) a test webm file to simulate recorded audio."""
     try:
-        # Generate test audio
-        duration = 3  # seconds
-        sample_rate = 16000
-        frequency = 440  # A4 note
-        
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        audio = np.sin(2 * np.pi * frequency * t) * 0.3
-        
-        # Add some variation
-        audio += np.sin(2 * np.pi * frequency * 2 * t) * 0.1
-        audio += np.random.normal(0, 0.05, len(audio))
-        
-        # Save as WAV first
-        temp_wav = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        sf.write(temp_wav.name, audio, sample_rate)
-        temp_wav.close()
-        
-        # Convert to WEBM using FFmpeg
-        temp_webm = tempfile.NamedTemporaryFile(suffix='.webm', delete=False)
-        temp_webm.close()
-        
-        import subprocess
-        result = subprocess.run([
-            'ffmpeg', '-i', temp_wav.name, '-c:a', 'libopus', 
-            '-b:a', '64k', temp_webm.name, '-y'
-        ], capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"FFmpeg error: {result.stderr}")
-            return None
-        
-        # Clean up WAV file
-        os.unlink(temp_wav.name)
-        
-        return temp_webm.name
-        
+        from test_fixtures import get_or_make_fixture
+
+        # Cached fixture: synthesized and transcoded once, reused later
+        return get_or_make_fixture(duration=3, sample_rate=16000,
+                                   frequency=440, ext='webm')
+
     except Exception as e:
         print(f"Error creating test webm: {e}")
         return None
@@ -74,15 +40,12 @@ def test_webm_transcription():
         print(f"   Audio duration: {result['audio_duration']:.2f}s")
         print(f"   Processing time: {result['transcription_time']:.2f}s")
         print(f"   Text: {result['text'][:100]}...")
-        
-        # Clean up
-        os.unlink(webm_file)
+
+        # The fixture is shared across runs; no cleanup needed
         return True
-        
+
     except Exception as e:
         print(f"❌ WEBM transcription failed: {e}")
-        if webm_file and os.path.exists(webm_file):
-            os.unlink(webm_file)
         return False
 
 def main():
@@ -6,50 +6,167 @@ A Flask web application for uploading and transcribing audio files.
 
 import os
 import time
+import queue
+import logging
+import hashlib
 import tempfile
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, render_template, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
-from whisper_demo import WhisperDemo
+import requests
+from requests.adapters import HTTPAdapter
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger('web_app')
+
 app = Flask(__name__)
+
+try:
+    # Gzip responses when the client accepts it; large segment arrays
+    # compress ~5x
+    from flask_compress import Compress
+    Compress(app)
+except ImportError:
+    pass
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
-app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['TRANSCRIPTS_FOLDER'] = 'transcriptions'
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
 # Allowed audio file extensions
-ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'flac', 'ogg', 'wma', 'aac', 'webm'}
+ALLOWED_EXTENSIONS = frozenset({'wav', 'mp3', 'm4a', 'flac', 'ogg', 'wma', 'aac', 'webm'})
+_ALLOWED_SUFFIXES = frozenset('.' + ext for ext in ALLOWED_EXTENSIONS)
+
+# Content types MediaRecorder typically produces for recorded blobs
+_ALLOWED_CONTENT_TYPES = frozenset({'audio/webm', 'audio/ogg', 'audio/wav', 'audio/mp4'})
+
+# Longest audio accepted for transcription (seconds)
+MAX_AUDIO_DURATION = float(os.environ.get('MAX_AUDIO_DURATION', 3600))
+
+# Reused keep-alive connection pool for the Asterisk AEAP server
+_asterisk_session = requests.Session()
+_asterisk_session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
 
 # Global Whisper demo instance
 whisper_demo = None
+_init_lock = threading.Lock()
+_model_ready = threading.Event()
+_transcribe_lock = threading.Lock()
+
+def json_response(obj, status=200):
+    """Build a JSON response with the fastest available encoder.
+
+    orjson serializes large segment arrays several times faster than
+    the stdlib encoder; the fallback uses compact separators so the
+    wire size matches either way.
+    """
+    if orjson is not None:
+        body = orjson.dumps(obj)
+    else:
+        body = json.dumps(obj, separators=(',', ':'))
+    return app.response_class(body, status=status, mimetype='application/json')
 
 def allowed_file(filename):
     """Check if file has allowed extension."""
     if not filename:
         return False
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    i = filename.rfind('.')
+    return i >= 0 and filename[i:].lower() in _ALLOWED_SUFFIXES
 
 def is_valid_audio_file(file):
     """Check if uploaded file is a valid audio file."""
-    # Check if it's a file upload with extension
-    if hasattr(file, 'filename') and file.filename:
-        return allowed_file(file.filename)
-    
-    # Check if it's a recorded audio blob (no filename)
-    if hasattr(file, 'content_type'):
-        # MediaRecorder typically creates webm or ogg files
-        return file.content_type in ['audio/webm', 'audio/ogg', 'audio/wav', 'audio/mp4']
-    
+    # File upload with a name: validate the extension
+    filename = getattr(file, 'filename', '') or ''
+    if filename:
+        return allowed_file(filename)
+
+    # Recorded audio blob (no filename): validate the content type
+    content_type = getattr(file, 'content_type', None)
+    if content_type is not None:
+        return content_type in _ALLOWED_CONTENT_TYPES
+
     # For recorded audio blobs without filename
     return True
 
+# Prefer tmpfs for scratch files so upload round-trips never touch disk
+_TMPDIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def save_upload_to_tempfile(file, hasher=None):
+    """Stream an upload into a temp file in 1 MB chunks.
+
+    Uses /dev/shm when available so the bytes never hit disk. If a hash
+    object is given it is updated as the data streams through. Returns
+    the temp file path; the caller is responsible for removing it.
+    """
+    suffix = os.path.splitext(secure_filename(file.filename))[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=_TMPDIR, delete=False) as tf:
+        for chunk in iter(lambda: file.stream.read(1 << 20), b''):
+            if hasher is not None:
+                hasher.update(chunk)
+            tf.write(chunk)
+        return tf.name
+
+def probe_audio_file(filepath):
+    """
+    Cheap pre-checks before any transcription work.
+
+    Returns an error message for oversized or overlong files, or None
+    if the file looks transcribable.
+    """
+    if os.path.getsize(filepath) > app.config['MAX_CONTENT_LENGTH']:
+        return 'File too large (limit: %d MB)' % (app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024))
+
+    # Header-only duration read; None for containers we can't probe
+    from whisper_demo import get_audio_duration
+    duration = get_audio_duration(filepath)
+    if duration is not None and duration > MAX_AUDIO_DURATION:
+        return 'Audio too long (%.0fs, limit: %.0fs)' % (duration, MAX_AUDIO_DURATION)
+
+    return None
+
 def init_whisper():
-    """Initialize Whisper model."""
+    """Initialize Whisper model (idempotent, safe to call from any thread)."""
     global whisper_demo
-    if whisper_demo is None:
-        whisper_demo = WhisperDemo(model_size="base")
-        whisper_demo.load_model()
+    with _init_lock:
+        if whisper_demo is None:
+            # Deferred so importing web_app doesn't pay the torch/whisper
+            # import cost before the server can even bind its socket
+            from whisper_demo import WhisperDemo
+            whisper_demo = WhisperDemo(model_size="base")
+            whisper_demo.load_model()
+            _model_ready.set()
+
+def transcribe_locked(filepath, language=None):
+    """Run a transcription while holding the model lock.
+
+    Whisper decoding installs KV-cache hooks on the shared model's
+    decoder, so concurrent transcriptions corrupt each other's caches.
+    Requests queue here for the model while the rest of the handler
+    (upload streaming, hashing, Asterisk forwarding) still overlaps
+    freely across the server's worker threads.
+    """
+    with _transcribe_lock:
+        return whisper_demo.transcribe_audio(filepath, language)
+
+def preload_whisper_async():
+    """Warm the Whisper model on a background thread.
+
+    The server can bind and answer /health immediately; an upload that
+    arrives mid-load simply blocks in init_whisper() until the model is
+    ready.
+    """
+    def _load():
+        try:
+            init_whisper()
+        except Exception as e:
+            logger.error("Background model load failed: %s", e)
+    threading.Thread(target=_load, daemon=True).start()
 
 @app.route('/')
 def index():
@@ -68,7 +185,7 @@ def upload_file():
             return jsonify({'error': 'No file selected'}), 400
         
         # Debug information
-        print(f"File details - Filename: {file.filename}, Content-Type: {file.content_type}")
+        logger.info("File details - filename=%s content_type=%s", file.filename, file.content_type)
         
         if not is_valid_audio_file(file):
             return jsonify({'error': 'Invalid file type. Allowed: ' + ', '.join(ALLOWED_EXTENSIONS) + ' or recorded audio'}), 400
@@ -78,23 +195,34 @@ def upload_file():
         if not language:
             language = None
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Initialize Whisper if not already done
-        init_whisper()
-        
-        # Transcribe audio
-        start_time = time.time()
-        result = whisper_demo.transcribe_audio(filepath, language)
-        processing_time = time.time() - start_time
-        
-        # Clean up uploaded file
-        os.remove(filepath)
-        
+        # Stream the upload straight to a temp file, skipping the
+        # uploads/ directory round-trip; hash it as it streams so the
+        # ETag below costs no extra read
+        hasher = hashlib.sha256()
+        filepath = save_upload_to_tempfile(file, hasher)
+        etag = '"%s"' % hasher.hexdigest()
+
+        try:
+            # Client already has the result for this exact audio
+            if request.headers.get('If-None-Match') == etag:
+                return '', 304
+
+            # Reject bad uploads before paying any transcription cost
+            probe_error = probe_audio_file(filepath)
+            if probe_error:
+                return jsonify({'error': probe_error}), 413
+
+            # Initialize Whisper if not already done
+            init_whisper()
+
+            # Transcribe audio
+            start_time = time.time()
+            result = transcribe_locked(filepath, language)
+            processing_time = time.time() - start_time
+        finally:
+            # Clean up temp file
+            os.remove(filepath)
+
         # Prepare response
         response = {
             'success': True,
@@ -105,9 +233,11 @@ def upload_file():
             'processing_time': processing_time,
             'speed_ratio': result['audio_duration'] / processing_time if processing_time > 0 else 0
         }
-        
-        return jsonify(response)
-        
+
+        resp = json_response(response)
+        resp.headers['ETag'] = etag
+        return resp
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -123,7 +253,7 @@ def asterisk_upload():
             return jsonify({'error': 'No file selected'}), 400
         
         # Debug information
-        print(f"Asterisk file details - Filename: {file.filename}, Content-Type: {file.content_type}")
+        logger.info("Asterisk file details - filename=%s content_type=%s", file.filename, file.content_type)
         
         if not is_valid_audio_file(file):
             return jsonify({'error': 'Invalid file type. Allowed: ' + ', '.join(ALLOWED_EXTENSIONS) + ' or recorded audio'}), 400
@@ -133,50 +263,145 @@ def asterisk_upload():
         if not language:
             language = 'en-US'
         
-        # Save uploaded file
+        # Stream to a temp file instead of the uploads/ directory
         filename = secure_filename(file.filename)
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
+        filepath = save_upload_to_tempfile(file)
+
         # Send to Asterisk server
-        import requests
-        
-        asterisk_url = 'http://localhost:3001/transcribe'
-        
-        with open(filepath, 'rb') as audio_file:
-            files = {'audio_file': (filename, audio_file, file.content_type)}
-            data = {'language': language}
-            
-            try:
-                response = requests.post(asterisk_url, files=files, data=data, timeout=60)
-                response.raise_for_status()
-                result = response.json()
-                
-                # Clean up uploaded file
-                os.remove(filepath)
-                
-                return jsonify(result)
-                
-            except requests.exceptions.RequestException as e:
-                # Clean up uploaded file
-                os.remove(filepath)
-                return jsonify({'error': f'Asterisk server error: {str(e)}'}), 500
-        
+        try:
+            result = forward_to_asterisk(filepath, filename, file.content_type, language)
+        except requests.exceptions.RequestException as e:
+            return jsonify({'error': f'Asterisk server error: {str(e)}'}), 500
+        finally:
+            # Clean up uploaded file
+            os.remove(filepath)
+
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def forward_to_asterisk(filepath, filename, content_type, language):
+    """Send an audio file to the Asterisk AEAP server and return its result."""
+    asterisk_url = 'http://localhost:3001/transcribe'
+
+    with open(filepath, 'rb') as audio_file:
+        files = {'audio_file': (filename, audio_file, content_type)}
+        data = {'language': language}
+        response = _asterisk_session.post(asterisk_url, files=files, data=data, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+@app.route('/compare', methods=['POST'])
+def compare_upload():
+    """Transcribe one upload with Whisper and Asterisk AEAP concurrently."""
+    try:
+        if 'audio_file' not in request.files:
+            return jsonify({'error': 'No audio file provided'}), 400
+
+        file = request.files['audio_file']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+
+        if not is_valid_audio_file(file):
+            return jsonify({'error': 'Invalid file type. Allowed: ' + ', '.join(ALLOWED_EXTENSIONS) + ' or recorded audio'}), 400
+
+        # Get language parameter
+        language = request.form.get('language', '').strip()
+
+        # Stream to a temp file instead of the uploads/ directory
+        filename = secure_filename(file.filename)
+        filepath = save_upload_to_tempfile(file)
+
+        # Reject bad uploads before paying any transcription cost
+        probe_error = probe_audio_file(filepath)
+        if probe_error:
+            os.remove(filepath)
+            return jsonify({'error': probe_error}), 413
+
+        # Initialize Whisper if not already done
+        init_whisper()
+
+        # Run both engines concurrently so latency is max() rather than sum()
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                whisper_future = executor.submit(
+                    transcribe_locked, filepath, language or None)
+                asterisk_future = executor.submit(
+                    forward_to_asterisk, filepath, filename,
+                    file.content_type, language or 'en-US')
+
+                # Collect each result independently so one engine failing
+                # doesn't lose the other's transcription
+                try:
+                    whisper_result = {'success': True, **whisper_future.result()}
+                except Exception as e:
+                    whisper_result = {'success': False, 'error': str(e)}
+                try:
+                    asterisk_result = {'success': True, **asterisk_future.result()}
+                except Exception as e:
+                    asterisk_result = {'success': False, 'error': str(e)}
+        finally:
+            os.remove(filepath)
+
+        return json_response({'whisper': whisper_result, 'asterisk': asterisk_result})
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/transcripts/<path:name>')
+def get_transcript(name):
+    """Serve a saved transcription file.
+
+    conditional=True lets Flask answer If-Modified-Since/Range requests
+    with 304/206 instead of resending the whole file.
+    """
+    return send_from_directory(app.config['TRANSCRIPTS_FOLDER'], name,
+                               conditional=True, max_age=3600)
+
 @app.route('/health')
 def health():
     """Health check endpoint."""
-    return jsonify({'status': 'healthy', 'whisper_loaded': whisper_demo is not None})
+    status = {'status': 'healthy',
+              'whisper_loaded': whisper_demo is not None,
+              'model_ready': _model_ready.is_set()}
+    if whisper_demo is not None:
+        status['cache_hits'] = whisper_demo.cache_hits
+        status['cache_misses'] = whisper_demo.cache_misses
+    return jsonify(status)
+
+def setup_logging():
+    """Route log records through a queue so handlers never block on I/O."""
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(levelname)s %(message)s'))
+    listener = QueueListener(log_queue, handler)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
 
 if __name__ == '__main__':
-    # Create upload directory
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    setup_logging()
     
+    # Warm the model in the background: the server binds immediately and
+    # the first upload doesn't pay the load cost
+    print("Loading Whisper model in the background...")
+    preload_whisper_async()
+
     print("Starting Whisper Web Demo...")
     print("Open your browser and go to: http://localhost:5001")
     print("Press Ctrl+C to stop the server")
-    
-    app.run(debug=True, host='0.0.0.0', port=5001)
+
+    if os.environ.get('FLASK_ENV') == 'dev':
+        # Werkzeug dev server with reloader/debugger for development only
+        app.run(debug=True, host='0.0.0.0', port=5001)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress not installed; falling back to the Flask dev server")
+            app.run(host='0.0.0.0', port=5001, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=5001, threads=8)
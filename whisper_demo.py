@@ -7,88 +7,444 @@ A comprehensive demonstration of the OpenAI Whisper speech-to-text model.
 import os
 import sys
 import time
+import json
+import logging
+import copy
+import hashlib
 import argparse
+import functools
+import threading
 import ssl
 import whisper
 import torch
 import numpy as np
-import librosa
+import torchaudio
 import soundfile as sf
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-# Fix SSL certificate issues on macOS
-ssl._create_default_https_context = ssl._create_unverified_context
+logger = logging.getLogger('whisper_demo')
+
+# Allow TF32 matmuls for the FP32 parts autocast leaves alone (no-op on CPU
+# and on GPUs without tensor cores)
+if hasattr(torch, 'set_float32_matmul_precision'):
+    torch.set_float32_matmul_precision("high")
+
+
+def _install_sdpa_attention() -> bool:
+    """
+    Route Whisper's attention through F.scaled_dot_product_attention.
+
+    The bundled whisper package computes attention with explicit
+    matmul-softmax-matmul; SDPA dispatches the same math to fused
+    FlashAttention / memory-efficient kernels on CUDA. The patched
+    version returns None for the attention weights, which the normal
+    transcription path never reads.
+
+    Returns:
+        True if the patch was applied (or already in place)
+    """
+    if not hasattr(torch.nn.functional, 'scaled_dot_product_attention'):
+        return False
+    try:
+        from whisper.model import MultiHeadAttention
+    except ImportError:
+        return False
+    if getattr(MultiHeadAttention, '_sdpa_patched', False):
+        return True
+
+    def qkv_attention(self, q, k, v, mask=None):
+        n_batch, n_ctx, n_state = q.shape
+        q = q.view(*q.shape[:2], self.n_head, -1).permute(0, 2, 1, 3)
+        k = k.view(*k.shape[:2], self.n_head, -1).permute(0, 2, 1, 3)
+        v = v.view(*v.shape[:2], self.n_head, -1).permute(0, 2, 1, 3)
+        # The mask is Whisper's causal mask; let the kernel apply it
+        # directly (irrelevant for single-token steps with a KV cache)
+        out = torch.nn.functional.scaled_dot_product_attention(
+            q, k, v, is_causal=mask is not None and n_ctx > 1)
+        return out.permute(0, 2, 1, 3).flatten(start_dim=2), None
+
+    MultiHeadAttention.qkv_attention = qkv_attention
+    MultiHeadAttention._sdpa_patched = True
+    return True
+
+
+_install_sdpa_attention()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_model_cached(model_size: str, device: str):
+    """Load a Whisper model once per (size, device) and reuse it."""
+    try:
+        model = whisper.load_model(model_size, device=device)
+    except Exception as e:
+        if "CERTIFICATE_VERIFY_FAILED" not in str(e):
+            raise
+        # macOS Pythons without installed certificates can't verify the
+        # model download; retry just this download with verification off
+        # instead of weakening TLS process-wide at import time
+        logger.warning("Model download failed certificate verification; "
+                       "retrying without verification")
+        original_context = ssl._create_default_https_context
+        ssl._create_default_https_context = ssl._create_unverified_context
+        try:
+            model = whisper.load_model(model_size, device=device)
+        finally:
+            ssl._create_default_https_context = original_context
+    if device == "cpu":
+        # Swap the Linear layers (the bulk of the weights) to int8 dynamic
+        # quantization so CPU matmuls run as int8 GEMMs; LayerNorm and the
+        # conv stems stay FP32. Best effort — some builds lack a quantized
+        # engine.
+        try:
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8)
+            logger.info("Applied int8 dynamic quantization for CPU inference")
+        except Exception as e:
+            logger.warning("Dynamic quantization unavailable, using FP32: %s", e)
+    return model
+
+
+@functools.lru_cache(maxsize=4)
+def _load_faster_model_cached(model_size: str, device: str):
+    """Load a faster-whisper (CTranslate2) model, int8-quantized."""
+    from faster_whisper import WhisperModel
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    return WhisperModel(model_size, device=device, compute_type=compute_type)
+
+
+def _decode_audio_pyav(audio_path: str) -> Optional[np.ndarray]:
+    """
+    Decode a compressed container in-process with PyAV.
+
+    Uses libavcodec directly instead of spawning an ffmpeg subprocess
+    per file, which saves the process-startup cost in batch jobs.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Mono 16 kHz float32 waveform, or None if PyAV is unavailable or
+        decoding fails (callers fall back to whisper.load_audio)
+    """
+    try:
+        import av
+    except ImportError:
+        return None
+    try:
+        chunks = []
+        with av.open(audio_path) as container:
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(format="flt", layout="mono",
+                                          rate=16000)
+            def _append(resampled):
+                # Older PyAV returns one frame, newer returns a list
+                if not isinstance(resampled, list):
+                    resampled = [resampled]
+                for out in resampled:
+                    if out is not None:
+                        chunks.append(out.to_ndarray().ravel())
+
+            for frame in container.decode(stream):
+                _append(resampler.resample(frame))
+            # Flush the resampler's internal FIFO, which otherwise holds
+            # back (and drops) the tail of the clip when rates differ
+            _append(resampler.resample(None))
+        if not chunks:
+            return None
+        return np.concatenate(chunks).astype(np.float32)
+    except Exception as e:
+        logger.warning("PyAV decode failed for %s: %s", audio_path, e)
+        return None
+
+
+def autocast_dtype() -> Optional[torch.dtype]:
+    """
+    Pick the reduced-precision dtype for CUDA inference.
+
+    Returns:
+        torch.bfloat16 on Ampere or newer (sm_80+), torch.float16 on older
+        CUDA GPUs, or None when running on CPU
+    """
+    if not torch.cuda.is_available():
+        return None
+    major, _ = torch.cuda.get_device_capability()
+    return torch.bfloat16 if major >= 8 else torch.float16
+
+
+# Transcription result cache (keyed by audio content hash + model + language)
+CACHE_DIR = Path(".stt_cache")
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+# How many short clips to push through the encoder in one launch
+DECODE_BATCH_SIZE = 8
+
+# Audio formats batch_transcribe picks up
+_AUDIO_EXTS = frozenset({'.wav', '.mp3', '.m4a', '.flac', '.ogg', '.wma', '.webm'})
+
+
+def hash_audio_file(audio_path: str) -> str:
+    """
+    Compute the SHA-256 hex digest of an audio file's contents.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Hex digest string
+    """
+    with open(audio_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def get_audio_duration(audio_path: str) -> Optional[float]:
+    """
+    Get the duration of an audio file from its header without decoding it.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Duration in seconds, or None if the header could not be read
+        (e.g. for compressed containers soundfile does not understand)
+    """
+    try:
+        info = sf.info(audio_path)
+        return info.frames / info.samplerate
+    except Exception:
+        return None
 
 
 class WhisperDemo:
     """A comprehensive demo class for OpenAI Whisper functionality."""
     
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", compile_model: bool = False,
+                 backend: str = "openai"):
         """
         Initialize the Whisper demo with a specified model size.
-        
+
         Args:
             model_size: Size of the Whisper model to use (tiny, base, small, medium, large)
+            compile_model: JIT-compile the encoder/decoder with torch.compile
+                (CUDA only; first transcription pays the compile cost)
+            backend: "openai" for the reference whisper package, "faster"
+                for faster-whisper (CTranslate2, int8-quantized; requires
+                the faster-whisper package)
         """
         self.model_size = model_size
+        self.compile_model = compile_model
+        self.backend = backend
         self.model = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"Using device: {self.device}")
+        self.cache_hits = 0
+        self.cache_misses = 0
+        logger.info("Using device: %s", self.device)
         
     def load_model(self) -> None:
-        """Load the Whisper model."""
-        print(f"Loading Whisper model '{self.model_size}'...")
+        """Load the Whisper model (reusing an already-loaded one if cached)."""
+        logger.info("Loading Whisper model '%s'...", self.model_size)
         start_time = time.time()
-        
+
         try:
-            self.model = whisper.load_model(self.model_size, device=self.device)
+            if self.backend == "faster":
+                self.model = _load_faster_model_cached(self.model_size, self.device)
+            else:
+                self.model = _load_model_cached(self.model_size, self.device)
+                if self.compile_model:
+                    self._compile_model()
             load_time = time.time() - start_time
-            print(f"Model loaded successfully in {load_time:.2f} seconds")
+            logger.info("Model loaded successfully in %.2f seconds", load_time)
         except Exception as e:
-            print(f"Error loading model: {e}")
+            logger.error("Error loading model: %s", e)
             sys.exit(1)
+
+    def _compile_model(self) -> None:
+        """Wrap the encoder/decoder in torch.compile (CUDA only, best effort)."""
+        if self.device != "cuda" or not hasattr(torch, 'compile'):
+            return
+        if getattr(self.model, '_compiled', False):
+            return
+        try:
+            self.model.encoder = torch.compile(
+                self.model.encoder, mode="reduce-overhead", fullgraph=False)
+            self.model.decoder = torch.compile(
+                self.model.decoder, mode="reduce-overhead", fullgraph=False)
+            self.model._compiled = True
+            logger.info("Compiled encoder/decoder with torch.compile")
+        except Exception as e:
+            logger.warning("torch.compile failed, using eager model: %s", e)
+
+    @classmethod
+    def warm(cls, model_size: str = "base") -> "WhisperDemo":
+        """
+        Load a model at process start so the first transcription doesn't
+        pay the load latency.
+
+        Args:
+            model_size: Size of the Whisper model to preload
+
+        Returns:
+            A WhisperDemo instance with the model already loaded
+        """
+        demo = cls(model_size=model_size)
+        demo.load_model()
+        return demo
     
-    def transcribe_audio(self, audio_path: str, language: Optional[str] = None) -> Dict[str, Any]:
+    def transcribe_audio(self, audio_path: str, language: Optional[str] = None,
+                         audio_data: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """
         Transcribe audio file using Whisper.
-        
+
         Args:
             audio_path: Path to the audio file
             language: Optional language code (e.g., 'en', 'es', 'fr')
-            
+            audio_data: Optional already-decoded waveform (16 kHz float32),
+                used by batch_transcribe to prefetch decoding off-thread
+
         Returns:
             Dictionary containing transcription results
         """
         if self.model is None:
             self.load_model()
-        
-        print(f"Transcribing audio: {audio_path}")
-        
-        # Validate audio file
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
-        # Load and preprocess audio
-        audio_data = self._load_audio(audio_path)
-        
-        # Transcribe
+
+        logger.info("Transcribing audio: %s", audio_path)
+
+        # Validate audio file with a single stat call (the decoder will
+        # open it right after, so an exists/open pair would double up)
+        try:
+            Path(audio_path).stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Audio file not found: {audio_path}") from None
+
+        # Check the result cache before doing any decoding
+        cache_key = self._cache_key(audio_path, language)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            self.cache_hits += 1
+            logger.info("Cache hit, skipping transcription: %s", audio_path)
+            return cached
+        self.cache_misses += 1
+
+        if self.backend == "faster":
+            transcription = self._transcribe_faster(audio_path, language)
+            self._cache_store(cache_key, transcription)
+            return transcription
+
+        # Load and preprocess audio (unless prefetched), moving it to the
+        # device up front so the mel spectrogram is computed there too
+        if audio_data is None:
+            audio_data = self._load_audio(audio_path)
+        audio_data = self._to_device(audio_data)
+
+        # Transcribe; on CUDA run the encoder/decoder matmuls on tensor
+        # cores via autocast (bf16 on Ampere+, fp16 otherwise)
         start_time = time.time()
-        result = self.model.transcribe(
-            audio_data,
-            language=language,
-            fp16=False if self.device == "cpu" else True
-        )
+        dtype = autocast_dtype()
+        with torch.inference_mode():
+            if dtype is not None:
+                with torch.autocast("cuda", dtype=dtype):
+                    result = self.model.transcribe(
+                        audio_data,
+                        language=language,
+                        fp16=(dtype is torch.float16)
+                    )
+            else:
+                result = self.model.transcribe(
+                    audio_data,
+                    language=language,
+                    fp16=False
+                )
         transcription_time = time.time() - start_time
-        
-        return {
+
+        transcription = {
             "text": result["text"].strip(),
             "language": result.get("language", "unknown"),
             "segments": result.get("segments", []),
             "transcription_time": transcription_time,
             "audio_duration": len(audio_data) / 16000  # Assuming 16kHz sample rate
         }
-    
+        self._cache_store(cache_key, transcription)
+        return transcription
+
+    def _transcribe_faster(self, audio_path: str, language: Optional[str]) -> Dict[str, Any]:
+        """
+        Transcribe through the faster-whisper (CTranslate2) backend.
+
+        Args:
+            audio_path: Path to the audio file
+            language: Optional language code
+
+        Returns:
+            Result dictionary in the same shape as the openai backend's
+        """
+        start_time = time.time()
+        segments, info = self.model.transcribe(
+            audio_path, language=language, vad_filter=True)
+        segment_dicts = [
+            {"id": i, "start": s.start, "end": s.end, "text": s.text}
+            for i, s in enumerate(segments)  # generator; decoding happens here
+        ]
+        transcription_time = time.time() - start_time
+
+        return {
+            "text": "".join(s["text"] for s in segment_dicts).strip(),
+            "language": info.language,
+            "segments": segment_dicts,
+            "transcription_time": transcription_time,
+            "audio_duration": info.duration
+        }
+
+    def _cache_key(self, audio_path: str, language: Optional[str]) -> str:
+        """Build a cache key from the audio content hash, backend, model size and language."""
+        return (f"{hash_audio_file(audio_path)}_{self.backend}"
+                f"_{self.model_size}_{language or 'auto'}")
+
+    def _cache_lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached transcription result, or None if absent or expired."""
+        cache_file = CACHE_DIR / f"{cache_key}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime > CACHE_TTL:
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _cache_store(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Save a transcription result to the disk cache (best effort)."""
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(CACHE_DIR / f"{cache_key}.json", 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+        except OSError as e:
+            logger.warning("Could not write transcription cache: %s", e)
+
+    def _to_device(self, audio: np.ndarray):
+        """
+        Move a waveform to the transcription device.
+
+        On CUDA the upload goes through pinned memory with a non-blocking
+        copy, and the tensor stays resident so the mel spectrogram and
+        encoder read it without another host-to-device transfer. On CPU
+        the numpy array is returned unchanged.
+
+        Args:
+            audio: Waveform as a float32 numpy array
+
+        Returns:
+            A CUDA tensor on GPU, or the original numpy array on CPU
+        """
+        if self.device != "cuda":
+            return audio
+        return torch.from_numpy(audio).pin_memory().to(
+            self.device, non_blocking=True)
+
     def _load_audio(self, audio_path: str) -> np.ndarray:
         """
         Load and preprocess audio file for Whisper.
@@ -100,28 +456,109 @@ class WhisperDemo:
             Preprocessed audio array
         """
         try:
-            # For webm files, use whisper's built-in loading which handles FFmpeg
+            # For webm files, decode in-process with PyAV if available,
+            # otherwise fall back to whisper's FFmpeg subprocess
             if audio_path.lower().endswith('.webm'):
+                audio = _decode_audio_pyav(audio_path)
+                if audio is not None:
+                    return audio
                 return whisper.load_audio(audio_path)
             
-            # For other formats, try librosa first
-            audio, sr = librosa.load(audio_path, sr=16000, mono=True)
-            
-            # Ensure audio is float32
-            if audio.dtype != np.float32:
-                audio = audio.astype(np.float32)
-            
+            # For other formats, decode with soundfile and resample with
+            # torchaudio (polyphase in C, far faster than a Python resampler)
+            audio, sr = sf.read(audio_path, dtype='float32', always_2d=False)
+
+            # Downmix stereo to mono
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+
+            if sr != 16000:
+                waveform = torch.from_numpy(audio)
+                waveform = torchaudio.functional.resample(
+                    waveform, sr, 16000, lowpass_filter_width=16)
+                audio = waveform.numpy()
+
             return audio
-            
+
         except Exception as e:
-            print(f"Error loading audio with librosa: {e}")
+            logger.warning("Error loading audio with soundfile: %s", e)
             # Fallback to whisper's built-in loading (uses FFmpeg)
             try:
                 return whisper.load_audio(audio_path)
             except Exception as e2:
-                print(f"Error loading audio with whisper: {e2}")
+                logger.error("Error loading audio with whisper: %s", e2)
                 raise e2
     
+    def _detect_language(self, audio_file) -> str:
+        """
+        Detect the spoken language from the first 30 seconds of a file.
+
+        Args:
+            audio_file: Path of the audio file to sample
+
+        Returns:
+            The most probable language code
+        """
+        audio = self._to_device(self._load_audio(str(audio_file)))
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), self.model.dims.n_mels).to(self.device)
+        with torch.inference_mode():
+            _, probs = self.model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+    def _transcribe_short_batch(self, audio_files, language: Optional[str] = None):
+        """
+        Transcribe a group of clips (30 seconds or shorter) in one pass.
+
+        All clips are padded to Whisper's 30 second window, their mel
+        spectrograms stacked into an (N, 80, 3000) batch, and the encoder
+        and decoder run once over the whole batch instead of once per file.
+
+        Args:
+            audio_files: Paths of audio files that each fit in one window
+            language: Optional language code shared by the batch
+
+        Returns:
+            List of transcription result dictionaries, one per file
+        """
+        mels = []
+        durations = []
+        for audio_file in audio_files:
+            audio = self._to_device(self._load_audio(str(audio_file)))
+            durations.append(len(audio) / 16000)
+            # large-v3 expects 128 mel bins, so follow the model's dims
+            # rather than the 80-bin default
+            mels.append(whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(audio), self.model.dims.n_mels))
+        mel_batch = torch.stack(mels).to(self.device)
+
+        dtype = autocast_dtype()
+        options = whisper.DecodingOptions(
+            language=language,
+            fp16=(dtype is torch.float16),
+            without_timestamps=True
+        )
+
+        start_time = time.time()
+        with torch.inference_mode():
+            if dtype is not None:
+                with torch.autocast("cuda", dtype=dtype):
+                    decoded = self.model.decode(mel_batch, options)
+            else:
+                decoded = self.model.decode(mel_batch, options)
+        batch_time = time.time() - start_time
+
+        results = []
+        for audio_file, item, duration in zip(audio_files, decoded, durations):
+            results.append({
+                "text": item.text.strip(),
+                "language": item.language,
+                "segments": [],
+                "transcription_time": batch_time / len(audio_files),
+                "audio_duration": duration
+            })
+        return results
+
     def transcribe_with_timestamps(self, audio_path: str, language: Optional[str] = None) -> None:
         """
         Transcribe audio and display results with timestamps.
@@ -162,41 +599,171 @@ class WhisperDemo:
             output_dir: Directory to save transcription results
             language: Optional language code
         """
-        input_path = Path(input_dir)
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
-        
-        # Supported audio formats
-        audio_extensions = {'.wav', '.mp3', '.m4a', '.flac', '.ogg', '.wma'}
-        
-        audio_files = [f for f in input_path.iterdir() 
-                      if f.suffix.lower() in audio_extensions]
-        
+
+        # List with scandir (one getdents pass, stat results cached on the
+        # entries) and order by size so similar-length clips batch together
+        with os.scandir(input_dir) as entries:
+            sized_files = [
+                (entry.stat().st_size, Path(entry.path))
+                for entry in entries
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].lower() in _AUDIO_EXTS
+            ]
+        sized_files.sort(key=lambda item: item[0])
+        audio_files = [audio_file for _, audio_file in sized_files]
+
         if not audio_files:
-            print(f"No audio files found in {input_dir}")
+            logger.info("No audio files found in %s", input_dir)
             return
         
-        print(f"Found {len(audio_files)} audio files to transcribe")
-        
+        logger.info("Found %d audio files to transcribe", len(audio_files))
+
+        if self.model is None:
+            self.load_model()
+
+        # Detect the language once on the first file and share it with the
+        # rest of the batch, instead of paying a detection pass per file
+        if language is None and self.backend == "openai":
+            try:
+                language = self._detect_language(audio_files[0])
+                logger.info("Detected language '%s' from %s, using it for the batch",
+                            language, audio_files[0].name)
+            except Exception as e:
+                logger.warning("Language detection failed, falling back to per-file detection: %s", e)
+
+        # On CPU, transcribe several files concurrently: torch releases the
+        # GIL inside its ops, so worker threads keep all cores busy. The
+        # intra-op threads are split across workers so the workers don't
+        # oversubscribe each other. Decoding installs KV-cache hooks on the
+        # model's decoder, so a whisper model must not be shared between
+        # concurrently decoding threads — each worker gets its own replica
+        # of the (int8-quantized) weights instead.
+        if self.device == "cpu" and self.backend == "openai" and len(audio_files) > 1:
+            workers = min(4, max(1, (os.cpu_count() or 1) // 2))
+            if workers > 1:
+                replicas = [self.model]
+                replicas += [copy.deepcopy(self.model)
+                             for _ in range(workers - 1)]
+                thread_state = threading.local()
+                clones = []
+
+                def _transcribe_one(audio_file):
+                    if not hasattr(thread_state, 'demo'):
+                        clone = WhisperDemo(model_size=self.model_size,
+                                            backend=self.backend)
+                        clone.model = replicas.pop()
+                        clones.append(clone)
+                        thread_state.demo = clone
+                    try:
+                        logger.info("Processing: %s", audio_file.name)
+                        result = thread_state.demo.transcribe_audio(
+                            str(audio_file), language)
+                        self._save_batch_result(output_path, audio_file, result)
+                    except Exception as e:
+                        logger.error("Error processing %s: %s", audio_file.name, e)
+
+                # Lower the process-global intra-op thread count only for
+                # the pool's lifetime, then put it back so later
+                # single-file transcriptions keep all cores
+                previous_threads = torch.get_num_threads()
+                torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+                try:
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        list(pool.map(_transcribe_one, audio_files))
+                finally:
+                    torch.set_num_threads(previous_threads)
+
+                # Fold the workers' cache counters back into this instance
+                for clone in clones:
+                    self.cache_hits += clone.cache_hits
+                    self.cache_misses += clone.cache_misses
+                return
+
+        # Split into clips that fit Whisper's 30 second window (batched
+        # through the encoder in one launch) and longer files, which keep
+        # the per-file sliding-window path. Files whose header we cannot
+        # read are treated as long.
+        short_files = []
+        long_files = []
         for audio_file in audio_files:
+            duration = get_audio_duration(str(audio_file))
+            if (self.backend == "openai" and duration is not None
+                    and duration <= 30):
+                short_files.append((duration, audio_file))
+            else:
+                long_files.append(audio_file)
+
+        # Sort short clips by duration so each batch pads similar lengths
+        short_files.sort(key=lambda item: item[0])
+        short_files = [audio_file for _, audio_file in short_files]
+
+        for i in range(0, len(short_files), DECODE_BATCH_SIZE):
+            batch = short_files[i:i + DECODE_BATCH_SIZE]
             try:
-                print(f"\nProcessing: {audio_file.name}")
-                result = self.transcribe_audio(str(audio_file), language)
-                
-                # Save results
-                output_file = output_path / f"{audio_file.stem}_transcription.txt"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(f"File: {audio_file.name}\n")
-                    f.write(f"Language: {result['language']}\n")
-                    f.write(f"Duration: {result['audio_duration']:.2f}s\n")
-                    f.write(f"Transcription time: {result['transcription_time']:.2f}s\n")
-                    f.write("\nTranscription:\n")
-                    f.write(result['text'])
-                
-                print(f"Results saved to: {output_file}")
-                
+                logger.info("Processing batch of %d short clips", len(batch))
+                results = self._transcribe_short_batch(batch, language)
+                for audio_file, result in zip(batch, results):
+                    self._save_batch_result(output_path, audio_file, result)
             except Exception as e:
-                print(f"Error processing {audio_file.name}: {e}")
+                # Don't drop the whole batch: retry its files one by one
+                # through the normal path
+                logger.warning("Batched decoding failed (%s); retrying files individually", e)
+                for audio_file in batch:
+                    try:
+                        logger.info("Processing: %s", audio_file.name)
+                        result = self.transcribe_audio(str(audio_file), language)
+                        self._save_batch_result(output_path, audio_file, result)
+                    except Exception as file_error:
+                        logger.error("Error processing %s: %s",
+                                     audio_file.name, file_error)
+
+        if long_files:
+            # Overlap I/O with GPU work: decode the next file's audio on a
+            # worker thread while the current file transcribes, and hand
+            # result writes off so they never stall the loop
+            with ThreadPoolExecutor(max_workers=2) as io_pool:
+                # faster-whisper decodes internally, so only the openai
+                # backend benefits from prefetched waveforms
+                prefetch = self.backend == "openai"
+                next_audio = (io_pool.submit(self._load_audio, str(long_files[0]))
+                              if prefetch else None)
+                write_futures = []
+                for i, audio_file in enumerate(long_files):
+                    audio_future = next_audio
+                    next_audio = (io_pool.submit(self._load_audio,
+                                                 str(long_files[i + 1]))
+                                  if prefetch and i + 1 < len(long_files) else None)
+                    try:
+                        logger.info("Processing: %s", audio_file.name)
+                        result = self.transcribe_audio(
+                            str(audio_file), language,
+                            audio_data=audio_future.result() if audio_future else None)
+                        write_futures.append(io_pool.submit(
+                            self._save_batch_result, output_path,
+                            audio_file, result))
+                    except Exception as e:
+                        logger.error("Error processing %s: %s",
+                                     audio_file.name, e)
+                for write_future in write_futures:
+                    write_future.result()
+
+    def _save_batch_result(self, output_path: Path, audio_file: Path,
+                           result: Dict[str, Any]) -> None:
+        """Write one transcription result to the batch output directory."""
+        output_file = output_path / f"{audio_file.stem}_transcription.txt"
+        # Assemble the whole report first and write it in one syscall
+        body = (
+            f"File: {audio_file.name}\n"
+            f"Language: {result['language']}\n"
+            f"Duration: {result['audio_duration']:.2f}s\n"
+            f"Transcription time: {result['transcription_time']:.2f}s\n"
+            "\nTranscription:\n"
+            f"{result['text']}"
+        )
+        output_file.write_text(body, encoding='utf-8')
+        logger.info("Results saved to: %s", output_file)
 
 
 def main():
@@ -209,11 +776,20 @@ def main():
     parser.add_argument("--language", type=str, help="Language code (e.g., 'en', 'es', 'fr')")
     parser.add_argument("--batch", type=str, help="Directory containing audio files for batch processing")
     parser.add_argument("--output", type=str, help="Output directory for batch processing")
-    
+    parser.add_argument("--compile", action="store_true",
+                       help="JIT-compile the model with torch.compile (CUDA only)")
+    parser.add_argument("--backend", default="openai",
+                       choices=["openai", "faster"],
+                       help="Inference backend (faster requires the faster-whisper package)")
+
     args = parser.parse_args()
-    
+
+    # Show progress/diagnostic logs when run from the command line
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Initialize demo
-    demo = WhisperDemo(model_size=args.model)
+    demo = WhisperDemo(model_size=args.model, compile_model=args.compile,
+                       backend=args.backend)
     
     if args.audio:
         # Single file transcription
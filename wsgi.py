@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for running the Whisper web demo under gunicorn.
+
+Launch with:
+    gunicorn --preload -w 4 -b 0.0.0.0:5001 wsgi:app
+
+The model is loaded here at module scope, so with --preload it is
+loaded once in the gunicorn master before fork and the (read-only)
+weight tensors are shared copy-on-write across all workers instead of
+each worker holding its own copy.
+
+Note: this pre-fork sharing is for CPU inference. CUDA contexts cannot
+be forked; for GPU serving, run without --preload so each worker loads
+its own model.
+"""
+
+from web_app import app, init_whisper, setup_logging
+
+setup_logging()
+init_whisper()